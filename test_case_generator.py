@@ -4,40 +4,266 @@ Converts user stories into comprehensive test scenarios
 """
 
 import os
-import json
-from typing import List, Dict
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
+import argparse
+import asyncio
+import dbm
+import hashlib
+import shelve
+import sys
+import threading
+from functools import lru_cache
+from textwrap import dedent
+from typing import TYPE_CHECKING, Callable, List, Dict, Literal, Optional, Tuple, Type, Union, get_args
+import msgspec
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
+
+# Keep pytest from collecting this module (its name matches test_*.py)
+__test__ = False
+
+if TYPE_CHECKING:
+    # numpy is only needed by the opt-in semantic cache and is imported lazily
+    import numpy as np
+
+
+TestType = Literal["functional", "negative", "edge_case", "security"]
+Priority = Literal["high", "medium", "low"]
 
 
 class TestCase(BaseModel):
     """Model for a single test case"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     test_id: str = Field(description="Unique test case identifier (e.g., TC001)")
     title: str = Field(description="Brief test case title")
     description: str = Field(description="Detailed test case description")
     preconditions: List[str] = Field(description="List of preconditions")
     steps: List[str] = Field(description="Step-by-step test execution steps")
     expected_result: str = Field(description="Expected outcome")
-    test_type: str = Field(description="Type: functional, negative, edge_case, or security")
-    priority: str = Field(description="Priority: high, medium, or low")
+    test_type: TestType = Field(description="Type: functional, negative, edge_case, or security")
+    priority: Priority = Field(description="Priority: high, medium, or low")
 
 
 class TestSuite(BaseModel):
     """Model for complete test suite"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     user_story: str = Field(description="Original user story")
     test_cases: List[TestCase] = Field(description="List of generated test cases")
     coverage_summary: str = Field(description="Summary of test coverage")
 
 
+class TestCaseRecord(msgspec.Struct):
+    """Plain record mirroring TestCase, used for caching and export"""
+    test_id: str
+    title: str
+    description: str
+    preconditions: List[str]
+    steps: List[str]
+    expected_result: str
+    test_type: str
+    priority: str
+
+
+class TestSuiteRecord(msgspec.Struct):
+    """Plain record mirroring TestSuite, used for caching and export"""
+    user_story: str
+    test_cases: List[TestCaseRecord]
+    coverage_summary: str
+
+
+_RECORD_ENCODER = msgspec.json.Encoder()
+_RECORD_DECODER = msgspec.json.Decoder(TestSuiteRecord)
+
+
+def _to_record(test_suite: TestSuite) -> TestSuiteRecord:
+    """Convert a TestSuite into its msgspec record"""
+    return TestSuiteRecord(
+        user_story=test_suite.user_story,
+        test_cases=[TestCaseRecord(**dict(tc)) for tc in test_suite.test_cases],
+        coverage_summary=test_suite.coverage_summary
+    )
+
+
+def _from_record(record: TestSuiteRecord) -> TestSuite:
+    """Convert a (decoder-validated) msgspec record back into a TestSuite"""
+    return TestSuite.model_construct(
+        user_story=record.user_story,
+        test_cases=[
+            TestCase.model_construct(**msgspec.structs.asdict(tc))
+            for tc in record.test_cases
+        ],
+        coverage_summary=record.coverage_summary
+    )
+
+
+SEP = "=" * 80
+SUB_SEP = "-" * 80
+
+TEST_TYPES = set(get_args(TestType))
+PRIORITIES = set(get_args(Priority))
+
+
+def _parse_test_suite(text: str) -> TestSuite:
+    """
+    Build a TestSuite from JSON text without running full model validation
+    
+    The LLM output is constrained to the TestSuite schema, so the models are
+    constructed directly and only required keys and the enum-like fields are
+    checked.
+    """
+    # Structured outputs return bare JSON; only fall back to extracting a
+    # markdown-fenced block when the text is not a JSON object already
+    text = text.strip()
+    if not text.startswith("{") and "```" in text:
+        # Drop the opening fence line (whatever its language tag) and the closing fence
+        fenced = text.partition("```")[2].partition("\n")[2]
+        text = fenced.rpartition("```")[0]
+    data = orjson.loads(text)
+    
+    _check_shape(data, TestSuite, string_fields=("user_story", "coverage_summary"))
+    if not isinstance(data["test_cases"], list):
+        raise ValueError("TestSuite field 'test_cases' must be a list")
+    
+    return TestSuite.model_construct(
+        user_story=data["user_story"],
+        test_cases=[_construct_test_case(tc) for tc in data["test_cases"]],
+        coverage_summary=data["coverage_summary"]
+    )
+
+
+def _construct_test_case(data: dict) -> TestCase:
+    """Build a TestCase after checking its shape and enum-like fields"""
+    _check_shape(
+        data,
+        TestCase,
+        string_fields=("test_id", "title", "description", "expected_result", "test_type", "priority"),
+        list_fields=("preconditions", "steps")
+    )
+    # Tolerate casing/spacing drift such as "Functional" or "edge case"
+    data = dict(
+        data,
+        test_type=_normalize_choice(data["test_type"]),
+        priority=_normalize_choice(data["priority"])
+    )
+    if data["test_type"] not in TEST_TYPES:
+        raise ValueError(f"Invalid test type: {data['test_type']}")
+    if data["priority"] not in PRIORITIES:
+        raise ValueError(f"Invalid priority: {data['priority']}")
+    return TestCase.model_construct(**data)
+
+
+def _check_shape(data, model: Type[BaseModel], string_fields=(), list_fields=()):
+    """Raise ValueError unless data is an object with the model's fields and types"""
+    name = model.__name__
+    if not isinstance(data, dict):
+        raise ValueError(f"{name} must be a JSON object")
+    missing = model.model_fields.keys() - data.keys()
+    if missing:
+        raise ValueError(f"{name} is missing fields: {', '.join(sorted(missing))}")
+    for field in string_fields:
+        if not isinstance(data[field], str):
+            raise ValueError(f"{name} field '{field}' must be a string")
+    for field in list_fields:
+        if not isinstance(data[field], list) or not all(isinstance(item, str) for item in data[field]):
+            raise ValueError(f"{name} field '{field}' must be a list of strings")
+
+
+def _normalize_choice(value: str) -> str:
+    """Normalize an enum-like value to the lowercase, underscored form"""
+    return value.strip().lower().replace(" ", "_")
+
+
+SYSTEM_PROMPT = """You are an expert QA engineer specializing in test case design.
+Your task is to analyze user stories and generate comprehensive test cases.
+
+Generate test cases that cover:
+- Positive scenarios (happy path)
+- Negative scenarios (error handling)
+- Edge cases (boundary conditions)
+- Security considerations (if applicable)
+
+For each test case, provide:
+- Unique test ID
+- Clear title and description
+- Preconditions
+- Detailed steps
+- Expected results
+- Test type and priority"""
+
+USER_PROMPT = """Generate a comprehensive test suite with at least 5-8 test cases covering different scenarios.
+
+User Story:
+{user_story}"""
+
+# Built once at import; the schema does not depend on the generator instance.
+# extra="forbid" on the models already emits the additionalProperties: false
+# that OpenAI strict mode requires.
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "TestSuite",
+        "strict": True,
+        "schema": TestSuite.model_json_schema()
+    }
+}
+
+
+# Per-user location, so the cache does not depend on the working directory
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "test_case_generator", "responses"
+)
+
+# Failures that turn a cache read into a miss (or skip a cache write)
+_CACHE_ERRORS = (OSError, msgspec.DecodeError, msgspec.ValidationError, *dbm.error)
+
+# Shelve key prefix for the story embedding stored next to a cached suite
+_VECTOR_PREFIX = "vector:"
+
+# Part of every cache key, so entries from an older schema are never reused
+_SCHEMA_HASH = hashlib.sha256(
+    orjson.dumps(RESPONSE_FORMAT, option=orjson.OPT_SORT_KEYS)
+).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _prompt_template():
+    """Build the prompt template shared by all generators on first use"""
+    from langchain.prompts import ChatPromptTemplate
+    from langchain_core.messages import SystemMessage
+    
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=SYSTEM_PROMPT),
+        ("user", USER_PROMPT)
+    ])
+
+
 class TestCaseGenerator:
     """AI Agent for generating test cases from user stories"""
     
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+        similarity_threshold: Optional[float] = None,
+    ):
         """Initialize the test case generator"""
+        # LangChain is imported here rather than at module level so that
+        # importing this module (e.g. from verify_setup.py) stays fast
+        from langchain_openai import ChatOpenAI
+        
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         
+        # Exact-match response cache on disk (None disables it)
+        self.cache_path = cache_path
+        # Batch generation touches the shelve from worker threads
+        self._cache_lock = threading.Lock()
+        
+        # Semantic cache for near-duplicate stories (None disables it)
+        self.similarity_threshold = similarity_threshold
+        self._story_vectors: List["np.ndarray"] = []
+        self._story_suites: List[TestSuite] = []
+        
         if not self.api_key:
             raise ValueError(
                 "OpenAI API key not found. Set OPENAI_API_KEY environment variable "
@@ -51,112 +277,336 @@ class TestCaseGenerator:
             api_key=self.api_key
         )
         
-        # Setup output parser
-        self.parser = PydanticOutputParser(pydantic_object=TestSuite)
+        if self.similarity_threshold is not None:
+            from langchain_openai import OpenAIEmbeddings
+            
+            self.embeddings = OpenAIEmbeddings(
+                model="text-embedding-3-small",
+                api_key=self.api_key
+            )
+            self._load_similar_index()
         
-        # Create prompt template
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert QA engineer specializing in test case design.
-Your task is to analyze user stories and generate comprehensive test cases.
-
-Generate test cases that cover:
-- Positive scenarios (happy path)
-- Negative scenarios (error handling)
-- Edge cases (boundary conditions)
-- Security considerations (if applicable)
-
-For each test case, provide:
-- Unique test ID
-- Clear title and description
-- Preconditions
-- Detailed steps
-- Expected results
-- Test type and priority
-
-{format_instructions}"""),
-            ("user", """User Story:
-{user_story}
-
-Generate a comprehensive test suite with at least 5-8 test cases covering different scenarios.""")
-        ])
+        # Constrain decoding to the TestSuite schema (OpenAI structured outputs)
+        self.structured_llm = self.llm.bind(response_format=RESPONSE_FORMAT)
+        
+        # Shared prompt template. The system message is fully static so the
+        # provider can cache the shared prefix; only the user story varies.
+        self.prompt = _prompt_template()
+        
+        # Only the user message depends on the story, so keep the formatted
+        # system message and the user template to skip full template resolution
+        self._system_message, self._user_template = self.prompt.messages
     
-    def generate_test_cases(self, user_story: str) -> TestSuite:
+    def generate_test_cases(
+        self,
+        user_story: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> TestSuite:
         """
         Generate test cases from a user story
         
         Args:
             user_story: The user story to generate test cases for
+            on_chunk: Optional callback receiving the raw response text as it streams in
             
         Returns:
             TestSuite object containing all generated test cases
         """
+        # Serve repeated prompts from the cache
+        formatted_prompt, cache_key = self._prepare(user_story)
+        test_suite = self._load_cached(cache_key)
+        if test_suite is not None:
+            return test_suite
+        
         try:
-            # Validate input
-            if not user_story or not user_story.strip():
-                raise ValueError("User story cannot be empty")
-            
-            # Format prompt
-            formatted_prompt = self.prompt.format_messages(
-                user_story=user_story,
-                format_instructions=self.parser.get_format_instructions()
-            )
+            # Reuse the suite of a near-identical story
+            story_vector = self._embed_story(user_story)
+            test_suite = self._find_similar(user_story, story_vector)
+            if test_suite is not None:
+                return test_suite
             
-            # Generate response
-            response = self.llm.invoke(formatted_prompt)
+            # Stream response
+            chunks = []
+            for chunk in self.structured_llm.stream(formatted_prompt):
+                chunks.append(chunk.content)
+                if on_chunk:
+                    on_chunk(chunk.content)
             
             # Parse response
-            test_suite = self.parser.parse(response.content)
+            test_suite = _parse_test_suite("".join(chunks))
+        except Exception as e:
+            raise RuntimeError("Error generating test cases") from e
+        
+        self._remember(cache_key, story_vector, test_suite)
+        return test_suite
+    
+    async def agenerate_test_cases(self, user_story: str) -> TestSuite:
+        """
+        Async variant of generate_test_cases
+        
+        Args:
+            user_story: The user story to generate test cases for
             
+        Returns:
+            TestSuite object containing all generated test cases
+        """
+        # Serve repeated prompts from the cache; shelve I/O runs in a worker
+        # thread so it does not block other stories in a batch
+        formatted_prompt, cache_key = self._prepare(user_story)
+        test_suite = await self._run_blocking(self._load_cached, cache_key)
+        if test_suite is not None:
             return test_suite
+        
+        try:
+            # Reuse the suite of a near-identical story
+            story_vector = await self._aembed_story(user_story)
+            test_suite = self._find_similar(user_story, story_vector)
+            if test_suite is not None:
+                return test_suite
             
+            # Generate response
+            response = await self.structured_llm.ainvoke(formatted_prompt)
+            
+            # Parse response
+            test_suite = _parse_test_suite(response.content)
         except Exception as e:
-            raise Exception(f"Error generating test cases: {str(e)}")
+            raise RuntimeError("Error generating test cases") from e
+        
+        await self._run_blocking(self._remember, cache_key, story_vector, test_suite)
+        return test_suite
+    
+    async def agenerate_batch(
+        self,
+        user_stories: List[str],
+        max_concurrency: int = 5,
+    ) -> List[Union[TestSuite, Exception]]:
+        """
+        Generate test suites for several user stories concurrently
+        
+        Args:
+            user_stories: The user stories to generate test cases for
+            max_concurrency: Maximum number of stories in flight at once
+            
+        Returns:
+            One entry per input story, in input order: its TestSuite, or the
+            exception raised for it, so one failure does not discard the rest
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def generate(user_story: str) -> TestSuite:
+            async with semaphore:
+                return await self.agenerate_test_cases(user_story)
+        
+        return list(await asyncio.gather(
+            *(generate(story) for story in user_stories),
+            return_exceptions=True
+        ))
+    
+    def generate_test_cases_batch(
+        self,
+        user_stories: List[str],
+        max_concurrency: int = 5,
+    ) -> List[Union[TestSuite, Exception]]:
+        """
+        Generate test suites for several user stories in one pass
+        
+        Up to max_concurrency LLM requests are sent concurrently, so the total
+        time approaches that of the slowest story rather than the sum of all.
+        
+        Args:
+            user_stories: The user stories to generate test cases for
+            max_concurrency: Maximum number of stories in flight at once
+            
+        Returns:
+            One entry per input story, in input order: its TestSuite, or the
+            exception raised for it
+        """
+        return asyncio.run(self.agenerate_batch(user_stories, max_concurrency))
+    
+    @staticmethod
+    async def _run_blocking(func, *args):
+        """Run a blocking call in the default executor"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    def _prepare(self, user_story: str) -> Tuple[list, str]:
+        """
+        Validate and format a user story
+        
+        Returns:
+            The formatted prompt and its exact-match cache key
+        """
+        if not user_story or not user_story.strip():
+            raise ValueError("User story cannot be empty")
+        
+        formatted_prompt = self._format_prompt(user_story)
+        return formatted_prompt, self._cache_key(formatted_prompt)
+    
+    def _remember(self, cache_key: str, story_vector: Optional["np.ndarray"], test_suite: TestSuite):
+        """Record a freshly generated suite in the exact-match and semantic caches"""
+        self._store_cached(cache_key, test_suite, story_vector)
+        self._remember_similar(story_vector, test_suite)
+    
+    def _format_prompt(self, user_story: str) -> list:
+        """Build the prompt messages for a user story"""
+        return [self._system_message, self._user_template.format(user_story=user_story)]
+    
+    def _cache_key(self, formatted_prompt) -> str:
+        """Hash the model settings, output schema and formatted prompt into a cache key"""
+        parts = [self.llm.model_name, str(self.llm.temperature), _SCHEMA_HASH]
+        parts.extend(f"{message.type}: {message.content}" for message in formatted_prompt)
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+    
+    def _load_cached(self, cache_key: str) -> Optional[TestSuite]:
+        """Return a previously generated test suite for this key, if any"""
+        if not self.cache_path:
+            return None
+        # A missing or unreadable store, or a stale entry, is a cache miss
+        try:
+            with self._cache_lock, shelve.open(self.cache_path, flag="r") as cache:
+                payload = cache.get(cache_key)
+            return _from_record(_RECORD_DECODER.decode(payload)) if payload else None
+        except _CACHE_ERRORS:
+            return None
+    
+    def _store_cached(
+        self,
+        cache_key: str,
+        test_suite: TestSuite,
+        story_vector: Optional["np.ndarray"] = None,
+    ):
+        """Save a parsed test suite (and its story embedding) for later runs"""
+        if not self.cache_path:
+            return
+        payload = _RECORD_ENCODER.encode(_to_record(test_suite))
+        try:
+            cache_dir = os.path.dirname(self.cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with self._cache_lock, shelve.open(self.cache_path) as cache:
+                cache[cache_key] = payload
+                if story_vector is not None:
+                    cache[_VECTOR_PREFIX + cache_key] = story_vector.tobytes()
+        except _CACHE_ERRORS as e:
+            print(f"⚠️  Could not write to the test case cache: {str(e)}")
+    
+    def _load_similar_index(self):
+        """Load the story embeddings saved with cached suites by earlier runs"""
+        if not self.cache_path:
+            return
+        import numpy as np
+        
+        try:
+            with self._cache_lock, shelve.open(self.cache_path, flag="r") as cache:
+                for key in cache.keys():
+                    if not key.startswith(_VECTOR_PREFIX):
+                        continue
+                    payload = cache.get(key[len(_VECTOR_PREFIX):])
+                    if not payload:
+                        continue
+                    try:
+                        test_suite = _from_record(_RECORD_DECODER.decode(payload))
+                    except _CACHE_ERRORS:
+                        continue
+                    self._remember_similar(np.frombuffer(cache[key], dtype=np.float32), test_suite)
+        except _CACHE_ERRORS:
+            pass
+    
+    def _embed_story(self, user_story: str) -> Optional["np.ndarray"]:
+        """Embed a user story as a unit vector for similarity lookups"""
+        if self.similarity_threshold is None:
+            return None
+        return self._unit_vector(self.embeddings.embed_query(user_story.strip()))
+    
+    async def _aembed_story(self, user_story: str) -> Optional["np.ndarray"]:
+        """Async variant of _embed_story"""
+        if self.similarity_threshold is None:
+            return None
+        return self._unit_vector(await self.embeddings.aembed_query(user_story.strip()))
+    
+    @staticmethod
+    def _unit_vector(embedding: List[float]) -> "np.ndarray":
+        """Normalize an embedding so inner product equals cosine similarity"""
+        import numpy as np
+        
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    def _find_similar(self, user_story: str, story_vector: Optional["np.ndarray"]) -> Optional[TestSuite]:
+        """Return the cached suite of the most similar story above the threshold"""
+        if story_vector is None or not self._story_vectors:
+            return None
+        import numpy as np
+        
+        scores = np.stack(self._story_vectors) @ story_vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+        return self._story_suites[best].model_copy(update={"user_story": user_story})
+    
+    def _remember_similar(self, story_vector: Optional["np.ndarray"], test_suite: TestSuite):
+        """Index a freshly generated suite for later similarity lookups"""
+        if story_vector is None:
+            return
+        self._story_vectors.append(story_vector)
+        self._story_suites.append(test_suite)
     
     def export_to_json(self, test_suite: TestSuite, filename: str = "test_cases.json"):
         """Export test suite to JSON file"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(test_suite.dict(), f, indent=2, ensure_ascii=False)
+            data = _RECORD_ENCODER.encode(_to_record(test_suite))
+            with open(filename, 'wb') as f:
+                f.write(msgspec.json.format(data, indent=2))
             print(f"✅ Test cases exported to {filename}")
         except Exception as e:
             print(f"❌ Error exporting to JSON: {str(e)}")
     
     def print_test_suite(self, test_suite: TestSuite):
         """Pretty print the test suite"""
-        print("\n" + "="*80)
-        print(f"📋 USER STORY")
-        print("="*80)
-        print(test_suite.user_story)
-        
-        print("\n" + "="*80)
-        print(f"🧪 GENERATED TEST CASES ({len(test_suite.test_cases)} cases)")
-        print("="*80)
-        
-        for i, tc in enumerate(test_suite.test_cases, 1):
-            print(f"\n[{tc.test_id}] {tc.title}")
-            print(f"Type: {tc.test_type} | Priority: {tc.priority}")
-            print(f"\nDescription: {tc.description}")
+        # Collect every line and write once instead of printing line by line
+        parts = [
+            f"\n{SEP}",
+            "📋 USER STORY",
+            SEP,
+            test_suite.user_story,
+            "",
+            SEP,
+            f"🧪 GENERATED TEST CASES ({len(test_suite.test_cases)} cases)",
+            SEP,
+        ]
+        
+        for tc in test_suite.test_cases:
+            parts.append(f"\n[{tc.test_id}] {tc.title}")
+            parts.append(f"Type: {tc.test_type} | Priority: {tc.priority}")
+            parts.append(f"\nDescription: {tc.description}")
             
             if tc.preconditions:
-                print("\nPreconditions:")
-                for pre in tc.preconditions:
-                    print(f"  • {pre}")
+                parts.append("\nPreconditions:")
+                parts.extend(f"  • {pre}" for pre in tc.preconditions)
             
-            print("\nSteps:")
-            for j, step in enumerate(tc.steps, 1):
-                print(f"  {j}. {step}")
+            parts.append("\nSteps:")
+            parts.extend(f"  {j}. {step}" for j, step in enumerate(tc.steps, 1))
             
-            print(f"\nExpected Result: {tc.expected_result}")
-            print("-" * 80)
+            parts.append(f"\nExpected Result: {tc.expected_result}")
+            parts.append(SUB_SEP)
         
-        print(f"\n📊 COVERAGE SUMMARY")
-        print("="*80)
-        print(test_suite.coverage_summary)
-        print("="*80 + "\n")
+        parts.extend([
+            "\n📊 COVERAGE SUMMARY",
+            SEP,
+            test_suite.coverage_summary,
+            f"{SEP}\n",
+        ])
+        sys.stdout.write("\n".join(parts) + "\n")
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function with example usage"""
+    parser = argparse.ArgumentParser(description="Generate test cases from user stories")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore cached results and always request a fresh generation"
+    )
+    args = parser.parse_args(argv)
     
     # Example user stories for testing
     example_stories = [
@@ -183,19 +633,41 @@ def main():
         - Maximum 10,000 records per export
         """,
     ]
+    # Strip the source indentation so it is not sent as extra prompt tokens
+    example_stories = [dedent(story).strip() for story in example_stories]
     
     try:
         # Initialize generator
         print("🚀 Initializing Test Case Generator...")
-        generator = TestCaseGenerator()
-        
+        generator = TestCaseGenerator(cache_path=None if args.no_cache else DEFAULT_CACHE_PATH)
+    except ValueError as e:
+        print(f"❌ Configuration Error: {str(e)}")
+        print("\n💡 Setup Instructions:")
+        print("1. Get your OpenAI API key from https://platform.openai.com/api-keys")
+        print("2. Set it as environment variable: export OPENAI_API_KEY='your-key-here'")
+        print("3. Or pass it when creating TestCaseGenerator(api_key='your-key')")
+        return
+    
+    try:
         # Use first example story or get from user
         print("\nSelect a user story to generate test cases:")
         print("1. Login functionality")
         print("2. CSV export functionality")
         print("3. Enter custom user story")
+        print("4. All example stories (batch)")
+        
+        choice = input("\nEnter choice (1-4): ").strip()
         
-        choice = input("\nEnter choice (1-3): ").strip()
+        if choice == "4":
+            print("\n⏳ Generating test cases for all example stories...")
+            results = generator.generate_test_cases_batch(example_stories)
+            for number, result in enumerate(results, 1):
+                if isinstance(result, Exception):
+                    cause = f": {result.__cause__}" if result.__cause__ else ""
+                    print(f"\n❌ Story {number} failed: {str(result)}{cause}")
+                else:
+                    generator.print_test_suite(result)
+            return
         
         if choice == "1":
             user_story = example_stories[0]
@@ -209,14 +681,22 @@ def main():
                 if line == "" and lines and lines[-1] == "":
                     break
                 lines.append(line)
-            user_story = "\n".join(lines[:-1])  # Remove last empty line
+            user_story = dedent("\n".join(lines[:-1])).strip()  # Remove last empty line
         else:
             print("Invalid choice. Using default story.")
             user_story = example_stories[0]
         
-        # Generate test cases
-        print("\n⏳ Generating test cases...")
-        test_suite = generator.generate_test_cases(user_story)
+        # Generate test cases, showing a running token count while streaming
+        print("\n⏳ Generating test cases...", end="", flush=True)
+        tokens = 0
+        
+        def show_progress(text):
+            nonlocal tokens
+            tokens += 1
+            print(f"\r⏳ Generating test cases... {tokens} tokens received", end="", flush=True)
+        
+        test_suite = generator.generate_test_cases(user_story, on_chunk=show_progress)
+        print()
         
         # Display results
         generator.print_test_suite(test_suite)
@@ -229,14 +709,10 @@ def main():
                 filename = "test_cases.json"
             generator.export_to_json(test_suite, filename)
         
-    except ValueError as e:
-        print(f"❌ Configuration Error: {str(e)}")
-        print("\n💡 Setup Instructions:")
-        print("1. Get your OpenAI API key from https://platform.openai.com/api-keys")
-        print("2. Set it as environment variable: export OPENAI_API_KEY='your-key-here'")
-        print("3. Or pass it when creating TestCaseGenerator(api_key='your-key')")
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        # Generation errors wrap the underlying failure as their cause
+        cause = f": {e.__cause__}" if e.__cause__ else ""
+        print(f"❌ Error: {str(e)}{cause}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,321 @@
+"""
+Offline tests for the test case generator, using a stub in place of the LLM
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import orjson
+import pytest
+
+import test_case_generator as tcg
+
+
+def make_test_case_data(**overrides):
+    """Return a valid test case dict as the LLM would emit it"""
+    data = {
+        "test_id": "TC001",
+        "title": "Successful login",
+        "description": "User logs in with valid credentials",
+        "preconditions": ["User account exists"],
+        "steps": ["Open login page", "Enter credentials", "Submit"],
+        "expected_result": "User lands on the dashboard",
+        "test_type": "functional",
+        "priority": "high",
+    }
+    data.update(overrides)
+    return data
+
+
+def make_suite_json(**test_case_overrides):
+    """Return a serialized suite with a single test case"""
+    return orjson.dumps({
+        "user_story": "As a user, I want to log in",
+        "test_cases": [make_test_case_data(**test_case_overrides)],
+        "coverage_summary": "Covers the happy path",
+    }).decode("utf-8")
+
+
+def make_generator(**kwargs):
+    """Build a real TestCaseGenerator; nothing is sent until an LLM call is made"""
+    kwargs.setdefault("cache_path", None)
+    return tcg.TestCaseGenerator(api_key="sk-test", **kwargs)
+
+
+def cache_key_for(generator, user_story):
+    """Return the exact-match cache key the generator uses for a story"""
+    return generator._cache_key(generator._format_prompt(user_story))
+
+
+class StubLLM:
+    """Stand-in for the structured LLM that echoes the prompt's story in its reply"""
+
+    def __init__(self, chunk_size=16):
+        self.chunk_size = chunk_size
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def reply(self, messages):
+        user_story = messages[-1].content.rpartition("User Story:\n")[2]
+        if "fail" in user_story:
+            raise ConnectionError("network down")
+        return orjson.dumps({
+            "user_story": user_story,
+            "test_cases": [make_test_case_data()],
+            "coverage_summary": "Covers the happy path",
+        }).decode("utf-8")
+
+    def stream(self, messages):
+        text = self.reply(messages)
+        for start in range(0, len(text), self.chunk_size):
+            yield SimpleNamespace(content=text[start:start + self.chunk_size])
+
+    async def ainvoke(self, messages):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Let earlier stories finish last to check results keep input order
+            await asyncio.sleep(0.01 if "slow" in messages[-1].content else 0)
+            return SimpleNamespace(content=self.reply(messages))
+        finally:
+            self.in_flight -= 1
+
+
+def make_stubbed_generator(**kwargs):
+    """Build a generator whose LLM is a StubLLM"""
+    generator = make_generator(**kwargs)
+    generator.structured_llm = StubLLM()
+    return generator
+
+
+def test_parse_bare_json():
+    suite = tcg._parse_test_suite(make_suite_json())
+    assert suite.user_story == "As a user, I want to log in"
+    assert suite.test_cases[0].steps == ["Open login page", "Enter credentials", "Submit"]
+
+
+@pytest.mark.parametrize("opening", ["```json", "```JSON", "```"])
+def test_parse_fenced_json(opening):
+    text = f"Here are the test cases:\n{opening}\n{make_suite_json()}\n```\n"
+    suite = tcg._parse_test_suite(text)
+    assert suite.test_cases[0].test_id == "TC001"
+
+
+def test_parse_rejects_missing_suite_fields():
+    with pytest.raises(ValueError, match="coverage_summary"):
+        tcg._parse_test_suite('{"user_story": "story", "test_cases": []}')
+
+
+def test_parse_rejects_missing_test_case_fields():
+    data = make_test_case_data()
+    del data["steps"]
+    text = orjson.dumps({
+        "user_story": "story",
+        "test_cases": [data],
+        "coverage_summary": "summary",
+    }).decode("utf-8")
+    with pytest.raises(ValueError, match="steps"):
+        tcg._parse_test_suite(text)
+
+
+def test_parse_normalizes_enum_like_fields():
+    suite = tcg._parse_test_suite(make_suite_json(test_type=" Edge Case ", priority="HIGH"))
+    assert suite.test_cases[0].test_type == "edge_case"
+    assert suite.test_cases[0].priority == "high"
+
+
+@pytest.mark.parametrize("field, value", [("test_type", "performance"), ("priority", "urgent")])
+def test_parse_rejects_unknown_enum_values(field, value):
+    with pytest.raises(ValueError, match="Invalid"):
+        tcg._parse_test_suite(make_suite_json(**{field: value}))
+
+
+@pytest.mark.parametrize("text, message", [
+    ("[]", "must be a JSON object"),
+    ('{"user_story": "s", "test_cases": {}, "coverage_summary": "c"}', "must be a list"),
+    ('{"user_story": "s", "test_cases": ["case"], "coverage_summary": "c"}', "must be a JSON object"),
+    ('{"user_story": 1, "test_cases": [], "coverage_summary": "c"}', "must be a string"),
+])
+def test_parse_rejects_malformed_suites(text, message):
+    with pytest.raises(ValueError, match=message):
+        tcg._parse_test_suite(text)
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ("test_type", None, "must be a string"),
+    ("steps", "abc", "must be a list of strings"),
+    ("preconditions", [1, 2], "must be a list of strings"),
+])
+def test_parse_rejects_malformed_test_cases(field, value, message):
+    with pytest.raises(ValueError, match=message):
+        tcg._parse_test_suite(make_suite_json(**{field: value}))
+
+def test_record_round_trip():
+    suite = tcg._parse_test_suite(make_suite_json())
+    payload = tcg._RECORD_ENCODER.encode(tcg._to_record(suite))
+    restored = tcg._from_record(tcg._RECORD_DECODER.decode(payload))
+    assert restored.model_dump() == suite.model_dump()
+
+
+def test_cache_key_is_stable():
+    generator = make_generator()
+    assert cache_key_for(generator, "story") == cache_key_for(make_generator(), "story")
+
+
+def test_cache_key_changes_with_prompt_and_settings():
+    generator = make_generator()
+    key = cache_key_for(generator, "story")
+    assert cache_key_for(generator, "other story") != key
+
+    warmer = make_generator()
+    warmer.llm = warmer.llm.model_copy(update={"temperature": 0.7})
+    assert cache_key_for(warmer, "story") != key
+
+
+def test_cache_store_and_load(tmp_path):
+    generator = make_generator(cache_path=str(tmp_path / "cache"))
+    suite = tcg._parse_test_suite(make_suite_json())
+
+    assert generator._load_cached("key") is None
+    generator._store_cached("key", suite)
+    assert generator._load_cached("key").model_dump() == suite.model_dump()
+
+
+def test_cache_treats_undecodable_entries_as_misses(tmp_path):
+    generator = make_generator(cache_path=str(tmp_path / "cache"))
+    with tcg.shelve.open(generator.cache_path) as cache:
+        cache["key"] = b'{"user_story": "entry from an older schema"}'
+    assert generator._load_cached("key") is None
+
+
+def test_cache_store_failure_warns(tmp_path, capsys):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    generator = make_generator(cache_path=str(blocker / "cache"))
+    generator._store_cached("key", tcg._parse_test_suite(make_suite_json()))
+    assert "Could not write to the test case cache" in capsys.readouterr().out
+
+def test_find_similar_respects_threshold():
+    generator = make_generator(similarity_threshold=0.9)
+    suite = tcg._parse_test_suite(make_suite_json())
+    generator._remember_similar(generator._unit_vector([1.0, 0.0]), suite)
+
+    close = generator._find_similar("As a customer, I want to sign in", generator._unit_vector([1.0, 0.1]))
+    assert close.user_story == "As a customer, I want to sign in"
+    assert close.test_cases == suite.test_cases
+
+    far = generator._find_similar("Export users to CSV", generator._unit_vector([0.0, 1.0]))
+    assert far is None
+
+
+def test_similar_index_persists_across_generators(tmp_path):
+    cache_path = str(tmp_path / "cache")
+    suite = tcg._parse_test_suite(make_suite_json())
+    first = make_generator(similarity_threshold=0.9, cache_path=cache_path)
+    first._remember(cache_key_for(first, "Sign in with email"), first._unit_vector([1.0, 0.0]), suite)
+
+    second = make_generator(similarity_threshold=0.9, cache_path=cache_path)
+    close = second._find_similar("Sign in with e-mail", second._unit_vector([1.0, 0.1]))
+    assert close.test_cases == suite.test_cases
+
+
+def test_find_similar_is_disabled_without_vectors():
+    generator = make_generator()
+    assert generator._embed_story("story") is None
+    assert generator._find_similar("story", None) is None
+    assert generator._find_similar("story", np.array([1.0], dtype=np.float32)) is None
+
+
+def test_batch_keeps_input_order():
+    generator = make_stubbed_generator()
+    stories = ["slow first story", "second story", "third story"]
+    results = generator.generate_test_cases_batch(stories)
+    assert [suite.user_story for suite in results] == stories
+
+
+def test_batch_reports_failures_per_story():
+    generator = make_stubbed_generator()
+    ok, failed = generator.generate_test_cases_batch(["working story", "story that will fail"])
+    assert ok.user_story == "working story"
+    assert isinstance(failed, RuntimeError)
+    assert isinstance(failed.__cause__, ConnectionError)
+
+
+def test_batch_limits_concurrency():
+    generator = make_stubbed_generator()
+    generator.generate_test_cases_batch([f"slow story {i}" for i in range(6)], max_concurrency=2)
+    assert generator.structured_llm.max_in_flight == 2
+
+
+def test_batch_uses_the_cache(tmp_path):
+    generator = make_stubbed_generator(cache_path=str(tmp_path / "cache"))
+    first = generator.generate_test_cases_batch(["story one", "story two"])
+    generator.structured_llm = None  # any LLM call would now fail
+    second = generator.generate_test_cases_batch(["story one", "story two"])
+    assert [suite.model_dump() for suite in second] == [suite.model_dump() for suite in first]
+
+
+def test_generate_streams_chunks_to_callback():
+    generator = make_stubbed_generator()
+    chunks = []
+    suite = generator.generate_test_cases("As a user, I want to reset my password", on_chunk=chunks.append)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == generator.structured_llm.reply(
+        generator._format_prompt("As a user, I want to reset my password")
+    )
+    assert suite.user_story == "As a user, I want to reset my password"
+
+
+def test_generate_chains_llm_errors():
+    generator = make_stubbed_generator()
+    with pytest.raises(RuntimeError, match="Error generating test cases") as excinfo:
+        generator.generate_test_cases("this story will fail")
+    assert isinstance(excinfo.value.__cause__, ConnectionError)
+
+
+@pytest.mark.parametrize("user_story", ["", "   \n"])
+def test_generate_rejects_empty_story_unwrapped(user_story):
+    generator = make_stubbed_generator()
+    with pytest.raises(ValueError, match="cannot be empty"):
+        generator.generate_test_cases(user_story)
+
+
+def test_print_test_suite_output_is_unchanged(capsys):
+    data = orjson.loads(make_suite_json())
+    data["test_cases"].append(make_test_case_data(
+        test_id="TC002", title="Wrong password", preconditions=[], steps=["Submit a bad password"],
+        expected_result="An error is shown", test_type="negative", priority="medium",
+    ))
+    suite = tcg._parse_test_suite(orjson.dumps(data).decode("utf-8"))
+    make_generator().print_test_suite(suite)
+
+    sep, sub_sep = "=" * 80, "-" * 80
+    expected = (
+        f"\n{sep}\n📋 USER STORY\n{sep}\nAs a user, I want to log in\n"
+        f"\n{sep}\n🧪 GENERATED TEST CASES (2 cases)\n{sep}\n"
+        "\n[TC001] Successful login\nType: functional | Priority: high\n"
+        "\nDescription: User logs in with valid credentials\n"
+        "\nPreconditions:\n  • User account exists\n"
+        "\nSteps:\n  1. Open login page\n  2. Enter credentials\n  3. Submit\n"
+        f"\nExpected Result: User lands on the dashboard\n{sub_sep}\n"
+        "\n[TC002] Wrong password\nType: negative | Priority: medium\n"
+        "\nDescription: User logs in with valid credentials\n"
+        "\nSteps:\n  1. Submit a bad password\n"
+        f"\nExpected Result: An error is shown\n{sub_sep}\n"
+        f"\n📊 COVERAGE SUMMARY\n{sep}\nCovers the happy path\n{sep}\n\n"
+    )
+    assert capsys.readouterr().out == expected
+
+
+def test_export_to_json_round_trips(tmp_path, capsys):
+    suite = tcg._parse_test_suite(make_suite_json(title="Connexion réussie ✓"))
+    path = tmp_path / "suite.json"
+    make_generator().export_to_json(suite, str(path))
+
+    text = path.read_text(encoding="utf-8")
+    assert "Connexion réussie ✓" in text
+    assert text.startswith('{\n  "user_story"')
+    assert orjson.loads(text) == suite.model_dump()
+    assert "exported to" in capsys.readouterr().out
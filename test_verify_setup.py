@@ -0,0 +1,55 @@
+"""
+Offline tests for the setup verification script
+"""
+
+import importlib.util
+
+import pytest
+
+import verify_setup
+
+
+@pytest.fixture(autouse=True)
+def clear_api_key_cache():
+    verify_setup.get_api_key.cache_clear()
+    yield
+    verify_setup.get_api_key.cache_clear()
+
+
+def test_check_dependencies_passes_when_all_found():
+    lines = []
+    assert verify_setup.check_dependencies(log=lines.append)
+    assert all(line.startswith("✅") for line in lines)
+
+
+def test_check_dependencies_reports_missing(monkeypatch):
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        importlib.util, "find_spec",
+        lambda name: None if name == "orjson" else real_find_spec(name),
+    )
+    lines = []
+    assert not verify_setup.check_dependencies(log=lines.append)
+    assert "❌ orjson NOT installed" in lines
+
+
+def run_main_with_basic_check(monkeypatch):
+    """Run main with the generator check replaced, returning whether it ran"""
+    calls = []
+    monkeypatch.setattr(verify_setup, "test_basic_functionality", lambda: calls.append(True) or True)
+    verify_setup.main()
+    return bool(calls)
+
+
+def test_main_skips_basic_check_without_api_key(monkeypatch, capsys):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    assert not run_main_with_basic_check(monkeypatch)
+    out = capsys.readouterr().out
+    assert "Skipped: fix the API key first" in out
+    assert "SOME CHECKS FAILED" in out
+
+
+def test_main_runs_basic_check_with_api_key(monkeypatch, capsys):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-0000")
+    assert run_main_with_basic_check(monkeypatch)
+    assert "Skipped" not in capsys.readouterr().out
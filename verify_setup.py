@@ -4,51 +4,59 @@ Quick verification script to check if everything is set up correctly
 
 import sys
 import os
+import importlib.util
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
-def check_python_version():
+def check_python_version(log=print):
     """Check if Python version is 3.8 or higher"""
     version = sys.version_info
     if version.major >= 3 and version.minor >= 8:
-        print(f"✅ Python version: {version.major}.{version.minor}.{version.micro}")
+        log(f"✅ Python version: {version.major}.{version.minor}.{version.micro}")
         return True
     else:
-        print(f"❌ Python version: {version.major}.{version.minor}.{version.micro}")
-        print("   Required: Python 3.8 or higher")
+        log(f"❌ Python version: {version.major}.{version.minor}.{version.micro}")
+        log("   Required: Python 3.8 or higher")
         return False
 
-def check_dependencies():
+def check_dependencies(log=print):
     """Check if required packages are installed"""
-    required = ['langchain', 'langchain_openai', 'pydantic', 'openai']
+    required = ['langchain', 'langchain_openai', 'pydantic', 'openai', 'msgspec', 'numpy', 'orjson']
     missing = []
     
     for package in required:
-        try:
-            __import__(package)
-            print(f"✅ {package} installed")
-        except ImportError:
-            print(f"❌ {package} NOT installed")
+        # Locate the package without executing its (slow) top-level code
+        if importlib.util.find_spec(package) is None:
+            log(f"❌ {package} NOT installed")
             missing.append(package)
+        else:
+            log(f"✅ {package} installed")
     
     if missing:
-        print(f"\n💡 Install missing packages with: pip install -r requirements.txt")
+        log(f"\n💡 Install missing packages with: pip install -r requirements.txt")
         return False
     return True
 
-def check_api_key():
+@lru_cache(maxsize=None)
+def get_api_key():
+    """Look up the OpenAI API key once and share it between the checks"""
+    return os.getenv('OPENAI_API_KEY')
+
+def check_api_key(log=print):
     """Check if OpenAI API key is configured"""
-    api_key = os.getenv('OPENAI_API_KEY')
+    api_key = get_api_key()
     
     if api_key:
         # Show only first and last 4 characters for security
         masked_key = f"{api_key[:7]}...{api_key[-4:]}"
-        print(f"✅ OpenAI API Key found: {masked_key}")
+        log(f"✅ OpenAI API Key found: {masked_key}")
         return True
     else:
-        print("❌ OpenAI API Key NOT found")
-        print("\n💡 Set it with:")
-        print("   export OPENAI_API_KEY='sk-your-key-here'  # Mac/Linux")
-        print("   set OPENAI_API_KEY=sk-your-key-here       # Windows CMD")
-        print("   $env:OPENAI_API_KEY='sk-your-key-here'    # Windows PowerShell")
+        log("❌ OpenAI API Key NOT found")
+        log("\n💡 Set it with:")
+        log("   export OPENAI_API_KEY='sk-your-key-here'  # Mac/Linux")
+        log("   set OPENAI_API_KEY=sk-your-key-here       # Windows CMD")
+        log("   $env:OPENAI_API_KEY='sk-your-key-here'    # Windows PowerShell")
         return False
 
 def test_basic_functionality():
@@ -57,9 +65,9 @@ def test_basic_functionality():
         from test_case_generator import TestCaseGenerator
         print("✅ Test case generator module loaded successfully")
         
-        # Try to initialize (this will check API key)
+        # Try to initialize with the key the API key check already found
         try:
-            generator = TestCaseGenerator()
+            generator = TestCaseGenerator(api_key=get_api_key())
             print("✅ Test case generator initialized successfully")
             return True
         except ValueError as e:
@@ -80,15 +88,34 @@ def main():
         ("Python Version", check_python_version),
         ("Dependencies", check_dependencies),
         ("API Key", check_api_key),
-        ("Basic Functionality", test_basic_functionality),
     ]
     
-    results = []
-    for name, check_func in checks:
+    # The independent checks run concurrently, each buffering its own
+    # output so the report is still printed in order
+    outputs = [[] for _ in checks]
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [
+            executor.submit(check_func, log=output.append)
+            for (_, check_func), output in zip(checks, outputs)
+        ]
+        results = [future.result() for future in futures]
+    
+    for (name, _), output in zip(checks, outputs):
         print(f"\n📋 Checking {name}...")
-        results.append(check_func())
+        for line in output:
+            print(line)
         print()
     
+    # Initializing the generator only makes sense once the API key is set
+    print("\n📋 Checking Basic Functionality...")
+    results_by_name = {name: ok for (name, _), ok in zip(checks, results)}
+    if results_by_name["API Key"]:
+        results.append(test_basic_functionality())
+    else:
+        print("⏭️  Skipped: fix the API key first")
+        results.append(False)
+    print()
+    
     print("="*60)
     if all(results):
         print("✅ ALL CHECKS PASSED! You're ready to generate test cases!")